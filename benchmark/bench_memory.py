@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# coding=utf-8
+'''
+Author: Li Yuhao
+Date: 2026-10-19 16:20:45
+LastEditTime: 2026-10-19 16:20:45
+LastEditors: your name
+Description: 保留/不保留表达式(keep_formula)时建模的峰值内存
+FilePath: \\pymip\\benchmark\\bench_memory.py
+
+usage: python benchmark/bench_memory.py --vars 20000 --rows 5000 --terms 20 --solvers LP_SOLVER CP_SAT_SOLVER
+'''
+
+import argparse
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(".")
+sys.path.append("..")
+
+from pymip.Config import CP_SAT_SOLVER, LP_SOLVER, SCIP_SOLVER
+from pymip.Solver import Solver
+
+
+# peak resident set size of the current process in MB (ru_maxrss is in KB on linux)
+_peak_rss = lambda: resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def build(solver_name: str, keep_formula: bool, num_vars: int, num_rows: int, num_terms: int, seed: int):
+    rng = np.random.default_rng(seed)
+    solver = Solver(solver_name = solver_name, keep_formula = keep_formula)
+    x = [solver.new_int_var(0, 10, f"x{i}") for i in range(num_vars)]
+    for k in range(num_rows):
+        indices = rng.choice(num_vars, size=num_terms, replace=False).tolist()
+        coeffs = rng.integers(1, 10, size=num_terms).tolist()
+        solver.add_constraint(sum(c * x[i] for c, i in zip(coeffs, indices)) <= 5 * num_terms, name=f"c{k}")
+    for i in range(num_vars):
+        solver.set_obj(-1, x[i])
+    return solver
+
+
+def child(args):
+    start_rss = _peak_rss()
+    start = time.perf_counter()
+    solver = build(args.child, args.keep_formula == "1", args.vars, args.rows, args.terms, args.seed)
+    elapsed = time.perf_counter() - start
+    print(f"{_peak_rss():.1f} {_peak_rss() - start_rss:.1f} {elapsed:.3f} {len(solver.constraint_formula)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vars", type=int, default=20000)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--terms", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--solvers", nargs="+", default=[LP_SOLVER, CP_SAT_SOLVER, SCIP_SOLVER])
+    parser.add_argument("--child", default="", help=argparse.SUPPRESS)
+    parser.add_argument("--keep-formula", default="1", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child(args)
+
+    print(f"vars: {args.vars}, rows: {args.rows}, terms per row: {args.terms}")
+    print(f"{'solver':<15}{'keep_formula':>14}{'peak RSS (MB)':>15}{'model (MB)':>12}{'build (s)':>11}{'saved':>8}")
+    for solver_name in args.solvers:
+        keep_model_rss = None
+        for keep_formula in ["1", "0"]:
+            # 峰值内存只增不减, 每种模式在单独的进程中运行
+            command = [
+                sys.executable, __file__, "--child", solver_name, "--keep-formula", keep_formula,
+                "--vars", str(args.vars), "--rows", str(args.rows), "--terms", str(args.terms), "--seed", str(args.seed)]
+            result = subprocess.run(command, capture_output=True, text=True)
+            if result.returncode != 0:
+                print(f"{solver_name:<15} failed: {result.stderr.strip().splitlines()[-1]}")
+                break
+            peak_rss, model_rss, elapsed, _ = result.stdout.strip().splitlines()[-1].split()
+            keep_model_rss = keep_model_rss or float(model_rss)
+            saved = 1 - float(model_rss) / keep_model_rss
+            print(f"{solver_name:<15}{keep_formula == '1'!s:>14}{float(peak_rss):>15.1f}{float(model_rss):>12.1f}{float(elapsed):>11.2f}{saved:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# coding=utf-8
+'''
+Author: Li Yuhao
+Date: 2026-10-19 18:42:10
+LastEditTime: 2026-10-19 18:42:10
+LastEditors: your name
+Description: sum() / quicksum() / dot() 构建大规模线性约束的耗时
+FilePath: \\pymip\\benchmark\\bench_quicksum.py
+
+usage: python benchmark/bench_quicksum.py --terms 10000 100000 1000000 --solvers LP_SOLVER CP_SAT_SOLVER
+'''
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(".")
+sys.path.append("..")
+
+from pymip import dot, quicksum
+from pymip.Config import CP_SAT_SOLVER, LP_SOLVER, SCIP_SOLVER
+from pymip.Solver import Solver
+
+
+def timeit(build) -> float:
+    start = time.perf_counter()
+    build()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--terms", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--max-sum-terms", type=int, default=20000, help="sum() is quadratic in the number of terms, skip it above this size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--solvers", nargs="+", default=[LP_SOLVER, CP_SAT_SOLVER, SCIP_SOLVER])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'solver':<15}{'terms':>9}{'sum() (s)':>11}{'quicksum() (s)':>16}{'dot() (s)':>11}{'speedup':>9}")
+    for solver_name in args.solvers:
+        for num_terms in args.terms:
+            try:
+                solver = Solver(solver_name = solver_name, keep_formula = False)
+            except NotImplementedError as e:
+                print(f"{solver_name:<15} skipped: {e}")
+                break
+            x = [solver.new_int_var(0, 10, f"x{i}") for i in range(num_terms)]
+            coeffs = rng.integers(1, 10, size=num_terms)
+            coeff_list = coeffs.tolist()
+            rhs = 5 * num_terms
+
+            sum_time = None
+            if num_terms <= args.max_sum_terms:
+                sum_time = timeit(lambda: solver.add_constraint(sum(coeff_list[i] * x[i] for i in range(num_terms)) <= rhs, name="sum"))
+            quicksum_time = timeit(lambda: solver.add_constraint(quicksum(coeff_list[i] * x[i] for i in range(num_terms)) <= rhs, name="quicksum"))
+            dot_time = timeit(lambda: solver.add_constraint(dot(coeffs, x) <= rhs, name="dot"))
+
+            sum_text = f"{sum_time:.3f}" if sum_time is not None else "skipped"
+            speedup = f"{sum_time / dot_time:.1f}x" if sum_time is not None else "-"
+            print(f"{solver_name:<15}{num_terms:>9}{sum_text:>11}{quicksum_time:>16.3f}{dot_time:>11.3f}{speedup:>9}")
+
+
+if __name__ == "__main__":
+    main()
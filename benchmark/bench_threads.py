@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# coding=utf-8
+'''
+Author: Li Yuhao
+Date: 2026-10-19 14:03:12
+LastEditTime: 2026-10-19 14:03:12
+LastEditors: your name
+Description: 不同线程数下的求解时间 (multi-dimensional knapsack)
+FilePath: \\pymip\\benchmark\\bench_threads.py
+
+usage: python benchmark/bench_threads.py --items 60 --dims 5 --threads 1 2 4 8 --solvers LP_SOLVER CP_SAT_SOLVER
+'''
+
+import argparse
+import sys
+import time
+from datetime import timedelta
+
+import numpy as np
+
+sys.path.append(".")
+sys.path.append("..")
+
+from pymip.Config import CP_SAT_SOLVER, LP_SOLVER, SCIP_SOLVER
+from pymip.Config import FEASIBLE, OPTIMAL
+from pymip.Solver import Solver, _available_cpus
+
+
+def build_knapsack(solver: Solver, items: int, dims: int, seed: int):
+    '''
+    description: max sum(p_i * x_i)  s.t.  sum(w_di * x_i) <= c_d,  x_i in {0, 1}
+    '''
+    rng = np.random.default_rng(seed)
+    weights = rng.integers(10, 100, size=(dims, items))
+    profits = weights.sum(axis=0) // dims + rng.integers(0, 20, size=items)
+    capacity = weights.sum(axis=1) // 2
+    x = [solver.new_bool_var(f"x{i}") for i in range(items)]
+    for d in range(dims):
+        solver.add_constraint(sum(int(weights[d, i]) * x[i] for i in range(items)) <= int(capacity[d]), name=f"dim{d}")
+    # set_obj minimizes, so profits are negated
+    for i in range(items):
+        solver.set_obj(-int(profits[i]), x[i])
+    # set_obj does not set the CP SAT objective
+    if solver.solver_name == CP_SAT_SOLVER:
+        solver.model.Minimize(sum(-int(profits[i]) * x[i].var for i in range(items)))
+    return x, profits
+
+
+def main():
+    cpus = _available_cpus()
+    default_threads = sorted(set([1, 2, 4, 8, 16, 32, 64, cpus]) & set(range(1, cpus + 1)))
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=60)
+    parser.add_argument("--dims", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--time-limit", type=float, default=60, help="seconds")
+    parser.add_argument("--threads", type=int, nargs="+", default=default_threads)
+    parser.add_argument("--solvers", nargs="+", default=[LP_SOLVER, CP_SAT_SOLVER, SCIP_SOLVER])
+    parser.add_argument("--deterministic", action="store_true")
+    args = parser.parse_args()
+
+    print(f"available cpus: {cpus}, items: {args.items}, dims: {args.dims}")
+    print(f"{'solver':<15}{'threads':>8}{'status':>12}{'profit':>12}{'time (s)':>10}{'speedup':>9}")
+    for solver_name in args.solvers:
+        base = None
+        for num_threads in args.threads:
+            try:
+                solver = Solver(
+                    solver_name = solver_name,
+                    time_limit = timedelta(seconds=args.time_limit),
+                    num_threads = num_threads,
+                    deterministic = args.deterministic)
+            except NotImplementedError as e:
+                print(f"{solver_name:<15} skipped: {e}")
+                break
+            x, profits = build_knapsack(solver, args.items, args.dims, args.seed)
+            start = time.perf_counter()
+            status = solver.solve()
+            elapsed = time.perf_counter() - start
+            profit = sum(int(profits[i]) * solver.get_var_value(x[i]) for i in range(args.items)) if status in [OPTIMAL, FEASIBLE] else None
+            base = base or elapsed
+            print(f"{solver_name:<15}{num_threads:>8}{status:>12}{str(profit):>12}{elapsed:>10.3f}{base / elapsed:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# coding=utf-8
+'''
+Author: Li Yuhao
+Date: 2026-10-19 10:12:31
+LastEditTime: 2026-10-19 10:12:31
+LastEditors: your name
+Description: 紧凑的列式二进制模型格式
+FilePath: \\pymip\\pymip\\Serialize.py
+'''
+
+import json
+import struct
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+__all__ = ["pack_arrays", "unpack_arrays", "encode_names", "decode_names"]
+
+# file layout:
+#   | magic (6 bytes) | version (uint16) | header length (uint32) | json header | padding | array 0 | padding | array 1 | ...
+# every array starts on an _ALIGN boundary so that it can be viewed in place (np.frombuffer / mmap) without copying.
+_MAGIC = b"PYMIP\x00"
+_VERSION = 1
+_ALIGN = 64
+_PREFIX = struct.Struct("<6sHI")
+
+_align = lambda offset: (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def pack_arrays(meta: Dict, arrays: Dict[str, np.ndarray]) -> bytes:
+    '''
+    description: 将元信息和若干numpy数组打包成一段连续的二进制数据
+    param [Dict] meta 可被json序列化的元信息
+    param [Dict] arrays 数组名称 -> 一维numpy数组
+    return [bytes]
+    '''
+    layout = {}
+    offset = 0
+    for key, array in arrays.items():
+        offset = _align(offset)
+        layout[key] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += array.nbytes
+    header = json.dumps({"meta": meta, "arrays": layout}).encode("utf-8")
+    data_start = _align(_PREFIX.size + len(header))
+
+    buffer = bytearray(data_start + offset)
+    _PREFIX.pack_into(buffer, 0, _MAGIC, _VERSION, len(header))
+    buffer[_PREFIX.size: _PREFIX.size + len(header)] = header
+    for key, array in arrays.items():
+        start = data_start + layout[key]["offset"]
+        buffer[start: start + array.nbytes] = np.ascontiguousarray(array).tobytes()
+    return bytes(buffer)
+
+
+def unpack_arrays(buffer) -> Tuple[Dict, Dict[str, np.ndarray]]:
+    '''
+    description: pack_arrays的逆过程. 返回的数组直接引用buffer中的内存(不复制),
+                 因此buffer可以是bytes, memoryview或者mmap对象
+    param [*] buffer 支持buffer协议的对象
+    return [Tuple[Dict, Dict[str, np.ndarray]]] 元信息, 数组
+    '''
+    buffer = memoryview(buffer)
+    if len(buffer) < _PREFIX.size:
+        raise ValueError("Not a PY-MIP model: data is too short!")
+    magic, version, header_len = _PREFIX.unpack_from(buffer, 0)
+    if magic != _MAGIC:
+        raise ValueError("Not a PY-MIP model: bad magic number!")
+    if version != _VERSION:
+        raise ValueError(f"Unsupported PY-MIP model version = {version}!")
+    header = json.loads(bytes(buffer[_PREFIX.size: _PREFIX.size + header_len]).decode("utf-8"))
+    data_start = _align(_PREFIX.size + header_len)
+
+    arrays = {}
+    for key, item in header["arrays"].items():
+        dtype = np.dtype(item["dtype"])
+        count = int(np.prod(item["shape"], dtype=np.int64))
+        arrays[key] = np.frombuffer(
+            buffer, dtype=dtype, count=count, offset=data_start + item["offset"]
+        ).reshape(item["shape"])
+    return header["meta"], arrays
+
+
+def encode_names(names: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    '''
+    description: 将名称列表编码为 (偏移量, utf-8字节) 两个数组, 每个名称只保存一次
+    param [List] names
+    return [Tuple[np.ndarray, np.ndarray]]
+    '''
+    encoded = [name.encode("utf-8") for name in names]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(item) for item in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+def decode_names(offsets: np.ndarray, data: np.ndarray) -> List[str]:
+    '''
+    description: encode_names的逆过程
+    param [np.ndarray] offsets
+    param [np.ndarray] data
+    return [List[str]]
+    '''
+    blob = data.tobytes()
+    offsets = offsets.tolist()
+    return [blob[offsets[i]: offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
@@ -9,37 +9,69 @@ Description:
 FilePath: \\pymip\\pymip\\Solver.py
 '''
 
+import math
+import mmap
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
 import numbers
 import os
 import pathlib
 import warnings
 from abc import ABC
 from datetime import timedelta
-from typing import Dict, List, Union
+from typing import Callable, Dict, Iterable, List, Tuple, Union
 
+import numpy as np
 from ortools.linear_solver import pywraplp as lp
 from ortools.sat.python import cp_model
 try:
     from pyscipopt import Model as ScipModel
+    from pyscipopt import quicksum as scip_quicksum
+    from pyscipopt import SCIP_STAGE
     pyscipopt_FLAG = True
 except:
     pyscipopt_FLAG = False
 
 from .Config import CP_SAT_SOLVER, LP_SOLVER, SCIP_SOLVER
 from .Config import FEASIBLE, IDLE, INFEASIBLE, NOT_SOLVED, OPTIMAL
+from .Serialize import decode_names, encode_names, pack_arrays, unpack_arrays
 
 
 
-__all__ = ["Solver", "IntVar", "BoolVar", "Variable", "Expression"]
+__all__ = ["Solver", "IntVar", "BoolVar", "Variable", "Expression", "LinearSum", "Constraint", "SolutionPool", "quicksum", "dot"]
 
 _is_real_number = lambda x: isinstance(x, numbers.Real) or isinstance(x, Constant)
 _is_var = lambda x: isinstance(x, IntVar) or isinstance(x, BoolVar) or isinstance(x, Variable) or isinstance(x, Constant)
 # _is_constant = lambda x: isinstance(x, Constant) or isinstance(x, numbers.Real)
 _is_integer_var = lambda x: isinstance(x, IntVar) or isinstance(x, BoolVar)
 _is_expression = lambda x: isinstance(x, Expression)
+# CP SAT 只接受整数(或无穷)的系数和上下界
+_is_integral = lambda x: x is None or abs(x) == math.inf or float(x).is_integer()
 _create_if_not_exists = lambda path_str: os.makedirs(path_str) if not os.path.exists(path_str) else None
 
 
+def _set_cp_sat_workers(parameters, num_workers: int) -> int:
+    '''
+    description: 设置CP SAT的求解线程数, "num_search_workers" 是旧版本ortools中使用的参数名
+    return [int] 原来的线程数
+    '''
+    name = "num_workers" if hasattr(parameters, "num_workers") else "num_search_workers"
+    previous = getattr(parameters, name)
+    setattr(parameters, name, num_workers)
+    return previous
+
+
+def _available_cpus() -> int:
+    '''
+    description: 当前进程可以使用的CPU数量(考虑CPU亲和性, 例如taskset或容器的CPU限制)
+    return [int]
+    '''
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
 
 """
 ======================================================================================
@@ -64,6 +96,8 @@ class AbstractVariavle(ABC):
         self._name = name
         self._var = None
         self._formula = name
+        self._index = None # 变量在所属Solver中的序号, 由Solver创建变量时赋值
+        self._solver = None # 创建该变量的Solver
     @property
     def var(self):
         return self._var
@@ -85,6 +119,24 @@ class AbstractVariavle(ABC):
     @property
     def integer(self):
         return self._integer
+
+    def set_bounds(self, lb, ub):
+        '''
+        description: 修改变量上下界, 在下一次 Solver.solve() 时同步到求解器中
+        param [*] lb 下界, None表示负无穷 (CP_SAT_SOLVER 的变量必须有有限的整数上下界)
+        param [*] ub 上界, None表示正无穷
+        return [*]
+        '''
+        if self._solver is None:
+            raise ValueError(f'"{self._name}" is not created by a Solver, its bounds can not be changed!')
+        if self._solver_name == CP_SAT_SOLVER and any(bound is None or abs(bound) == math.inf for bound in [lb, ub]):
+            raise ValueError(f'"{self._name}" is a {CP_SAT_SOLVER} variable, its bounds must be finite!')
+        if self._solver_name == CP_SAT_SOLVER and not (_is_integral(lb) and _is_integral(ub)):
+            raise ValueError(f'"{self._name}" is a {CP_SAT_SOLVER} variable, its bounds must be integers!')
+        self._lb = lb
+        self._ub = ub
+        self._solver._var_changed(self)
+        return
     
     # self + expr
     def __add__(self, expr):
@@ -279,10 +331,10 @@ class BoolVar(AbstractVariavle):
 class Expression(AbstractVariavle):
 
     def __repr__(self) -> str:
-        return self.__info
+        return self.__str__()
 
     def __str__(self) -> str:
-        return self.__info
+        return f'< PYMIP "Expression", {self.formula}, type: {self._solver_name} >'
 
         
     def __init__(self, left, right, solver_name: str, name: str = "", operation: str = "+") -> None:
@@ -292,49 +344,553 @@ class Expression(AbstractVariavle):
         self._operation = operation
         # the name of this formula
         self._name = name
-        self._formula = ""
 
         _left = left._var
         _right = right._var
 
+        # 含有 quicksum() / dot() 的表达式在使用时才生成公式字符串
+        self._lazy_formula = any(isinstance(item, LinearSum) or getattr(item, "_lazy_formula", False) for item in [left, right])
+        self._formula = None if self._lazy_formula else self._build_formula()
+
+        self._var = eval(f"(_left) {self._operation} (_right)")
+        return
+
+    @property
+    def formula(self):
+        if self._formula is None:
+            self._formula = self._build_formula()
+        return self._formula
+
+    def _build_formula(self) -> str:
+        left = self._left
+        right = self._right
         # get formula expression
         # if "+" or "-" operation
         if self._operation in ["+", "-"]:
             # "0 + x" => "x"; "0 - x" => "-x"
             if _is_real_number(left) and int(left.formula) == 0:
-                self._formula = f"{right.formula}" if self._operation == "+" else f"-{right.formula}"
+                return f"{right.formula}" if self._operation == "+" else f"-{right.formula}"
             # "x + 0" => "x"; "x - 0" => "x"
             elif _is_real_number(right) and int(right.formula) == 0:
-                self._formula = f"{left.formula}"
+                return f"{left.formula}"
             # otherwise "x + y" or "x - y"
             else:
-                self._formula = f"{left.formula} {self._operation} {right.formula}"
+                return f"{left.formula} {self._operation} {right.formula}"
         # if "*" 
         elif self._operation == "*":
             # "num * "
             if _is_real_number(left):
                 # "num * x" => "num * x"
                 if _is_var(right) or _is_real_number(right):
-                    self._formula = f"{left.formula} {self._operation} {right.formula}"
+                    return f"{left.formula} {self._operation} {right.formula}"
                 # "num * expr" => "num * (expr)"
                 elif _is_expression(right):
-                    self._formula = f"{left.formula} {self._operation} ({right.formula})"
+                    return f"{left.formula} {self._operation} ({right.formula})"
                 # otherwise "() * ()"
                 else:
-                    self._formula = f"({left.formula}) {self._operation} ({right.formula})"
+                    return f"({left.formula}) {self._operation} ({right.formula})"
             # otherwise "() * ()"
             else:
-                self._formula = f"({left.formula}) {self._operation} ({right.formula})"
+                return f"({left.formula}) {self._operation} ({right.formula})"
         elif self._operation in ["==", ">=", "<="]:
-            self._formula = f"{left.formula} {self._operation} {right.formula}"
+            return f"{left.formula} {self._operation} {right.formula}"
         else:
             # if self._operation == "/"
-            self._formula = f"({left.formula}) {self._operation} ({right.formula})"
+            return f"({left.formula}) {self._operation} ({right.formula})"
 
 
-        self._var = eval(f"(_left) {self._operation} (_right)")
+'''
+======================================================================================
+                                Linear Sum
+======================================================================================
+'''
+class _LpLinearSum(lp.LinearExpr):
+    '''
+    ortools linear solver 中直接由变量及系数列表构成的线性表达式, 不需要为每一项生成表达式对象
+    '''
+    def __init__(self, variables: List, coeffs: List[float]) -> None:
+        self.__variables = variables
+        self.__coeffs = coeffs
+
+    def __str__(self) -> str:
+        return " + ".join(f"{coeff} * {var}" for var, coeff in zip(self.__variables, self.__coeffs))
+
+    def AddSelfToCoeffMapOrStack(self, coeffs, multiplier, stack):
+        for var, coeff in zip(self.__variables, self.__coeffs):
+            coeffs[var] += coeff * multiplier
+
+
+class LinearSum(AbstractVariavle):
+    '''
+    由 quicksum() / dot() 一次性构建的线性求和 sum(coeff * var) + constant,
+    求解器表达式直接由系数生成, 公式字符串在使用时才生成
+    '''
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __str__(self) -> str:
+        return f'< PYMIP "LinearSum", {len(self._terms)} terms, type: {self._solver_name} >'
+
+    def __init__(self, terms: Dict[int, float], const: float, variables: Dict[int, AbstractVariavle], solver_name: str) -> None:
+        super().__init__(solver_name, lb = None, ub = None, integer = None, name = "")
+        self._terms = terms # {变量序号: 系数}
+        self._const = const # 常数项
+        self._variables = variables # {变量序号: 变量}
+        self._formula = None
+
+        backend_vars = [variables[index]._var for index in terms.keys()]
+        coeffs = list(terms.values())
+        if solver_name == LP_SOLVER:
+            var = _LpLinearSum(backend_vars, coeffs)
+        elif solver_name == CP_SAT_SOLVER:
+            # CP SAT 只接受整数系数
+            coeffs = [int(coeff) if float(coeff).is_integer() else coeff for coeff in coeffs]
+            const = int(const) if float(const).is_integer() else const
+            var = cp_model.LinearExpr.WeightedSum(backend_vars, coeffs)
+        elif solver_name == SCIP_SOLVER:
+            var = scip_quicksum(coeff * backend_var for backend_var, coeff in zip(backend_vars, coeffs))
+        else:
+            # 不含变量
+            var = 0
+        self._var = var + const if const else var
+        return
+
+    @property
+    def formula(self):
+        if self._formula is None:
+            parts = [f"{coeff} * {self._variables[index].formula}" for index, coeff in self._terms.items()]
+            if self._const or not parts:
+                parts.append(f"{self._const}")
+            self._formula = " + ".join(parts)
+        return self._formula
+
+
+def quicksum(iterable: Iterable) -> LinearSum:
+    '''
+    description: 一次遍历构建大规模线性求和, 代替 sum().
+                 sum() 会为每一项生成 "+" 表达式及其公式字符串, quicksum() 只累加系数, 然后直接生成求解器的线性表达式
+                 (CP_SAT_SOLVER: LinearExpr.WeightedSum; SCIP_SOLVER: quicksum; LP_SOLVER: 系数列表)
+    param [Iterable] iterable 变量, 常数或者线性表达式
+    return [LinearSum]
+    '''
+    terms: Dict[int, float] = {}
+    variables: Dict[int, AbstractVariavle] = {}
+    const = 0.0
+    solver_name = ""
+    for item in iterable:
+        if isinstance(item, numbers.Real):
+            const += item
+            continue
+        if isinstance(item, Constant):
+            const += float(item._var)
+            continue
+        if _is_var(item) and item._index is not None:
+            terms[item._index] = terms.get(item._index, 0.0) + 1.0
+            variables[item._index] = item
+        else:
+            item_terms, item_const = _linearize(item, variables)
+            for index, coeff in item_terms.items():
+                terms[index] = terms.get(index, 0.0) + coeff
+            const += item_const
+        solver_name = solver_name or item._solver_name
+    return LinearSum(terms, const, variables, solver_name)
+
+
+def dot(coeffs, variables) -> LinearSum:
+    '''
+    description: 计算 sum(coeffs[i] * variables[i]), 用法与 quicksum() 相同
+    param [*] coeffs 系数, 可以是列表或numpy数组
+    param [*] variables 变量, 可以是列表, 嵌套列表(变量块)或numpy数组, 展开后的长度需与coeffs相同
+    return [LinearSum]
+    '''
+    if not isinstance(variables, (list, tuple, np.ndarray)):
+        variables = list(variables)
+    variables = np.asarray(variables, dtype=object).ravel().tolist()
+    coeffs = np.asarray(coeffs, dtype=np.float64).ravel().tolist()
+    if len(coeffs) != len(variables):
+        raise ValueError(f"dot() got {len(coeffs)} coefficients but {len(variables)} variables!")
+    terms: Dict[int, float] = {}
+    var_dict: Dict[int, AbstractVariavle] = {}
+    for coeff, var in zip(coeffs, variables):
+        index = var._index
+        if index is None:
+            raise ValueError(f'"{var}" is not a variable created by a Solver!')
+        if index in terms:
+            terms[index] += coeff
+        else:
+            terms[index] = coeff
+            var_dict[index] = var
+    solver_name = variables[0]._solver_name if variables else ""
+    return LinearSum(terms, 0.0, var_dict, solver_name)
+
+
+'''
+======================================================================================
+                                Linear form
+======================================================================================
+'''
+def _linearize(expr, variables: Dict[int, AbstractVariavle] = None) -> Tuple[Dict[int, float], float]:
+    '''
+    description: 将表达式展开为线性形式 sum(coeff * var) + constant.
+                 采用显式栈遍历表达式树, 避免 sum() 生成的深层表达式树超出递归深度
+    param [*] expr 变量, 常数或者不含比较运算的表达式
+    param [Dict] variables 若不为None, 则记录表达式中出现的 {变量序号: 变量}
+    return [Tuple[Dict[int, float], float]] {变量序号: 系数}, 常数项
+    '''
+    results = []
+    stack = [(expr, False)]
+    while stack:
+        node, visited = stack.pop()
+        if isinstance(node, Constant):
+            results.append(({}, float(node._var)))
+        elif isinstance(node, Expression):
+            if not visited:
+                stack.append((node, True))
+                stack.append((node._right, False))
+                stack.append((node._left, False))
+                continue
+            (right, right_const), (left, left_const) = results.pop(), results.pop()
+            operation = node._operation
+            if operation in ["+", "-"]:
+                sign = 1.0 if operation == "+" else -1.0
+                # 每个中间结果只被使用一次, 可以直接在左侧字典上累加
+                for index, coeff in right.items():
+                    left[index] = left.get(index, 0.0) + sign * coeff
+                results.append((left, left_const + sign * right_const))
+            elif operation == "*" and not left:
+                results.append(({index: left_const * coeff for index, coeff in right.items()}, left_const * right_const))
+            elif operation == "*" and not right:
+                results.append(({index: right_const * coeff for index, coeff in left.items()}, left_const * right_const))
+            elif operation == "/" and not right and right_const != 0:
+                results.append(({index: coeff / right_const for index, coeff in left.items()}, left_const / right_const))
+            else:
+                raise ValueError(f'Expression "{node.formula}" is not linear!')
+        elif isinstance(node, LinearSum):
+            # 结果字典会被原地修改, 需要复制
+            results.append((dict(node._terms), node._const))
+            if variables is not None:
+                variables.update(node._variables)
+        elif _is_var(node) and node._index is not None:
+            results.append(({node._index: 1.0}, 0.0))
+            if variables is not None:
+                variables[node._index] = node
+        else:
+            raise ValueError(f'"{node}" is neither a constant nor a variable created by a Solver!')
+    return results.pop()
+
+
+def _linear_row(constraint) -> Tuple[Dict[int, float], float, float]:
+    '''
+    description: 将约束 "left (==|>=|<=) right" 转换为 lb <= sum(coeff * var) <= ub
+    param [Expression] constraint
+    return [Tuple[Dict[int, float], float, float]] {变量序号: 系数}, lb, ub
+    '''
+    if not _is_expression(constraint) or constraint._operation not in ["==", ">=", "<="]:
+        raise ValueError(f'"{constraint}" is not a constraint!')
+    left, left_const = _linearize(constraint._left)
+    right, right_const = _linearize(constraint._right)
+    for index, coeff in right.items():
+        left[index] = left.get(index, 0.0) - coeff
+    terms = {index: coeff for index, coeff in left.items() if coeff != 0}
+    rhs = right_const - left_const
+    if constraint._operation == "==":
+        return terms, rhs, rhs
+    elif constraint._operation == ">=":
+        return terms, rhs, math.inf
+    return terms, -math.inf, rhs
+
+
+def _set_repeated(field, values: List):
+    '''
+    description: 替换proto中repeated字段的全部取值(兼容protobuf与pybind11两种proto实现)
+    '''
+    if hasattr(field, "clear"):
+        field.clear()
+    else:
+        del field[:]
+    field.extend(values)
+    return
+
+
+'''
+======================================================================================
+                                Constraint
+======================================================================================
+'''
+class Constraint:
+    '''
+    约束句柄, 由 Solver.add_constraint() 返回.
+    约束统一表示为 lb <= sum(coeff * var) <= ub (表达式中的常数项已移到上下界中).
+    对约束的修改只记录在句柄中, 在下一次 Solver.solve() 时仅将修改的部分同步到求解器.
+    '''
+    __slots__ = (
+        "_solver", "_index", "_name", "_constraint", "_terms", "_lb", "_ub", "_enforce",
+        "_active", "_removed", "_active_literal", "_changed_vars", "_bounds_changed", "_constant")
+
+    def __str__(self) -> str:
+        state = "removed" if self._removed else ("active" if self._active else "inactive")
+        return f'< PYMIP.Constraint "{self._name}" ({self._lb} <= linear expression <= {self._ub}, {state}, type = {self._solver._solver_name}) >'
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __init__(self, solver, index: int, name: str, constraint, terms: Dict[int, float], lb: float, ub: float, enforce: int = -1, constant: bool = False) -> None:
+        self._solver = solver # 所属Solver
+        self._index = index # 约束在所属Solver中的序号
+        self._name = name
+        self._constraint = constraint # 求解器中的约束对象
+        self._terms = terms # {变量序号: 系数}, 非线性约束为None
+        self._lb = lb
+        self._ub = ub
+        self._enforce = enforce # 计算冲突约束时的启用变量序号, -1表示无
+        self._active = True
+        self._removed = False
+        self._active_literal = None # CP_SAT_SOLVER中用于停用约束的启用变量
+        self._changed_vars = set() # 系数被修改的变量序号
+        self._bounds_changed = False
+        self._constant = constant # add_constraint(True/False) 添加的不含变量的约束, 只能启用或停用
+        return
 
-        self.__info = f'< PYMIP "Expression", {self._formula}, type: {self._solver_name} >'
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def constraint(self):
+        return self._constraint
+
+    @property
+    def lb(self) -> float:
+        return self._lb
+
+    @property
+    def ub(self) -> float:
+        return self._ub
+
+    @property
+    def active(self) -> bool:
+        return self._active
+
+    @property
+    def removed(self) -> bool:
+        return self._removed
+
+    @property
+    def linear(self) -> bool:
+        return self._terms is not None
+
+    def _check_editable(self):
+        if self._removed:
+            raise ValueError(f'Constraint "{self._name}" has been removed!')
+        if self._terms is None:
+            raise ValueError(f'Constraint "{self._name}" is not linear and can not be modified!')
+        return
+
+    def _check_bounds_editable(self):
+        self._check_editable()
+        if self._constant:
+            raise ValueError(f'Constraint "{self._name}" is a constant (True/False) constraint, its coefficients and bounds can not be modified!')
+        return
+
+    def _check_integral(self, value: float, kind: str):
+        if self._solver._solver_name == CP_SAT_SOLVER and not _is_integral(value):
+            raise ValueError(f'Constraint "{self._name}" is a {CP_SAT_SOLVER} constraint, its {kind} must be integers, got {value}!')
+        return
+
+    def get_coefficient(self, var: Union[IntVar, BoolVar, Variable]) -> float:
+        '''
+        description: 返回变量在约束中的系数
+        '''
+        if self._terms is None:
+            raise ValueError(f'Constraint "{self._name}" is not linear!')
+        return self._terms.get(var._index, 0.0)
+
+    def set_coefficient(self, var: Union[IntVar, BoolVar, Variable], coeff: float):
+        '''
+        description: 修改变量在约束中的系数, 系数为0表示从约束中移除该变量
+        param [Union] var 由同一个Solver创建的变量
+        param [float] coeff 系数
+        return [*]
+        '''
+        self._check_bounds_editable()
+        if var._solver is not self._solver:
+            raise ValueError(f'"{var._name}" is not created by the Solver of constraint "{self._name}"!')
+        self._check_integral(coeff, "coefficients")
+        if coeff == 0:
+            self._terms.pop(var._index, None)
+        else:
+            self._terms[var._index] = float(coeff)
+        self._changed_vars.add(var._index)
+        self._solver._constraint_changed(self)
+        return
+
+    def set_bounds(self, lb: float = -math.inf, ub: float = math.inf):
+        '''
+        description: 修改约束上下界 lb <= sum(coeff * var) <= ub, CP_SAT_SOLVER 的上下界必须为整数
+        '''
+        self._check_bounds_editable()
+        self._check_integral(lb, "bounds")
+        self._check_integral(ub, "bounds")
+        self._lb = -math.inf if lb is None else float(lb)
+        self._ub = math.inf if ub is None else float(ub)
+        self._bounds_changed = True
+        self._solver._constraint_changed(self)
+        return
+
+    def set_rhs(self, rhs: float):
+        '''
+        description: 修改约束右端项. "==" 约束同时修改上下界, ">=" 约束修改下界, "<=" 约束修改上界;
+                     右端项是常数项移到右侧之后的值, 例如 "x + 3 <= y" 的右端项为 -3 (x - y <= -3)
+        param [float] rhs 右端项
+        return [*]
+        '''
+        self._check_bounds_editable()
+        self._check_integral(rhs, "bounds")
+        if self._lb == self._ub:
+            self.set_bounds(rhs, rhs)
+        elif self._lb == -math.inf:
+            self.set_bounds(self._lb, rhs)
+        elif self._ub == math.inf:
+            self.set_bounds(rhs, self._ub)
+        else:
+            raise ValueError(f'Constraint "{self._name}" has both bounds, use set_bounds() instead!')
+        return
+
+    def activate(self):
+        '''
+        description: 重新启用被停用的约束
+        '''
+        self._check_editable()
+        self._active = True
+        self._solver._constraint_changed(self)
+        return
+
+    def deactivate(self):
+        '''
+        description: 停用约束, 停用后可以通过 activate() 重新启用
+        '''
+        self._check_editable()
+        self._active = False
+        self._solver._constraint_changed(self)
+        return
+
+
+'''
+======================================================================================
+                                SolutionPool
+======================================================================================
+'''
+class SolutionPool:
+    '''
+    解池, 由 Solver.solve_pool() 返回.
+    values 的第k行为第k个解中全部变量(按照 Solver.all_vars 的顺序)的取值, 目标值较好的解在前.
+    '''
+    __slots__ = ("_values", "_objective_values", "_integer")
+
+    def __str__(self) -> str:
+        return f"< PYMIP.SolutionPool ({len(self)} solutions, {self._values.shape[1]} variables) >"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __init__(self, values: np.ndarray, objective_values: np.ndarray, integer: np.ndarray) -> None:
+        self._values = values # shape = (解的数量, 变量数量)
+        self._objective_values = objective_values # 没有目标函数时为nan
+        self._integer = integer # 变量是否为整数变量
+        return
+
+    def __len__(self) -> int:
+        return self._values.shape[0]
+
+    def __getitem__(self, k: int) -> np.ndarray:
+        return self._values[k]
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values
+
+    @property
+    def objective_values(self) -> np.ndarray:
+        return self._objective_values
+
+    def get_var_value(self, var: Union[Variable, IntVar, BoolVar], k: int = 0) -> float:
+        '''
+        description: 返回第k个解中变量的取值
+        param [*] var
+        param [int] k 解的序号
+        return [float]
+        '''
+        value = float(self._values[k, var._index])
+        return round(value) if self._integer[var._index] else value
+
+
+class _PoolBuilder:
+    '''
+    按顺序收集互不相同的解, 任意两个解之间至少有 diversity 个变量取值不同
+    '''
+    def __init__(self, k: int, num_vars: int, diversity: int) -> None:
+        self.values = np.empty((k, num_vars), dtype=np.float64)
+        self.objective_values = np.full(k, np.nan, dtype=np.float64)
+        self.size = 0
+        self.diversity = max(diversity, 1)
+        return
+
+    @property
+    def full(self) -> bool:
+        return self.size >= len(self.objective_values)
+
+    def add(self, values, objective_value: float = None) -> bool:
+        '''
+        description: 解与已收集的解差异足够大时加入解池
+        return [bool] 是否加入
+        '''
+        if self.full:
+            return False
+        values = np.asarray(values, dtype=np.float64)
+        if self.size:
+            differences = np.count_nonzero(np.abs(self.values[:self.size] - values) > 1e-6, axis=1)
+            if differences.min() < self.diversity:
+                return False
+        self.values[self.size] = values
+        if objective_value is not None:
+            self.objective_values[self.size] = objective_value
+        self.size += 1
+        return True
+
+
+class _CpSatPoolCallback(cp_model.CpSolverSolutionCallback):
+    '''
+    CP SAT 求解过程中的每个解: builder 不为None时直接加入解池(解池已满时停止搜索),
+    否则保存在 solutions 中(达到 limit 个时停止搜索)
+    '''
+    def __init__(self, indices: np.ndarray, objective: Tuple = None, builder: _PoolBuilder = None, limit: int = 0) -> None:
+        super().__init__()
+        self.indices = indices # 全部变量在cp model中的序号
+        self.objective = objective # (变量序号, 系数, offset, scaling_factor), 由解计算目标值; None表示没有目标函数
+        self.builder = builder
+        self.limit = limit
+        self.solutions: List[Tuple[np.ndarray, float]] = []
+        return
+
+    def on_solution_callback(self):
+        solution = np.asarray(self.Response().solution, dtype=np.float64)
+        values = solution[self.indices]
+        objective_value = None
+        if self.objective is not None:
+            variables, coeffs, offset, scaling_factor = self.objective
+            objective_value = scaling_factor * (float(solution[variables] @ coeffs) + offset)
+        if self.builder is None:
+            self.solutions.append((values, objective_value))
+            if self.limit and len(self.solutions) >= self.limit:
+                self.StopSearch()
+            return
+        self.builder.add(values, objective_value)
+        if self.builder.full:
+            self.StopSearch()
         return
 
 
@@ -372,7 +928,10 @@ class Solver:
         export_model_path: str = '', # 输出数学模型文件地址
         elaborate: bool = False, # 是否压缩显示计算过程
         compute_IIS: bool = False, # 是否计算冲突约束
-        problem_name = ""
+        problem_name = "",
+        num_threads: int = 0, # 求解线程数, 0表示根据当前进程可用的CPU数量自动设置 (SCIP只设置 parallel/maxnthreads, 仍使用 optimize())
+        deterministic: bool = False, # 多线程求解时是否保证结果可复现
+        keep_formula: bool = True, # 是否保留约束及目标函数的表达式(obj_formula, constraint_formula), 大模型可以关闭以节省内存
     ) -> None:
 
         """     功能参数    """
@@ -386,6 +945,9 @@ class Solver:
         # self.time_limit: int = int(time_limit.total_seconds() * 1000)
         self._time_limit = time_limit # 计算时间限制
         self._bad_constraint_info = [] # 冲突约束列表
+        self._num_threads = num_threads # 求解线程数
+        self._deterministic = deterministic # 多线程求解时是否保证结果可复现
+        self._keep_formula = keep_formula # 是否保留表达式
 
         self._elaborate = elaborate # 默认控制台不输出中间信息
         
@@ -398,6 +960,7 @@ class Solver:
         """     CP SAT 相关属性    """
         self._cp_sat_model: cp_model.CpModel = cp_model.CpModel() # cp model模型
         self._cp_sat_solver: cp_model.CpSolver = cp_model.CpSolver() # cp solver
+        self._cp_sat_callback: cp_model.CpSolverSolutionCallback = None # 求解过程中每个解的回调
 
         # 全部的cp_sat变量
         self._cp_sat_all_vars: Dict[str, cp_model.IntVar] = {}
@@ -429,7 +992,15 @@ class Solver:
 
         self.__obj_formula = []
         self.__constraint_formula = []
+        self.__constraints: List[Constraint] = [] # 全部约束句柄
+        self.__obj_coeffs: Dict[int, float] = {} # 目标函数中 {变量序号: 系数}
+        self.__nonlinear_obj = False # 目标函数中是否包含非线性项
+        # 上一次求解之后被修改的变量及约束, 在下一次求解前同步到求解器
+        self.__changed_vars: Dict[int, Union[IntVar, BoolVar, Variable]] = {}
+        self.__changed_constraints: Dict[int, Constraint] = {}
         self._objective_value = None # 最终目标值
+        self._solution_values: np.ndarray = None # 分解求解时合并后的变量取值
+        self._row_generation_stats: List[Dict] = [] # 行生成每一轮的统计信息
         self._status = IDLE # 求解器状态
         return
 
@@ -451,6 +1022,28 @@ class Solver:
         self._compute_IIS = _compute_IIS
         return
 
+    @property
+    def num_threads(self) -> int:
+        return self._num_threads if self._num_threads > 0 else _available_cpus()
+
+    @num_threads.setter
+    def num_threads(self, num_threads: int):
+        self._num_threads = num_threads
+        return
+
+    @property
+    def deterministic(self) -> bool:
+        return self._deterministic
+
+    @deterministic.setter
+    def deterministic(self, deterministic: bool):
+        self._deterministic = deterministic
+        return
+
+    @property
+    def keep_formula(self) -> bool:
+        return self._keep_formula
+
     @property
     def model(self):
         return self.__models[self._solver_name]
@@ -467,6 +1060,14 @@ class Solver:
     def constraint_formula(self) -> List[Expression]:
         return self.__constraint_formula
 
+    @property
+    def constraints(self) -> List[Constraint]:
+        return self.__constraints
+
+    @property
+    def row_generation_stats(self) -> List[Dict]:
+        return self._row_generation_stats
+
     @property
     def objective_value(self) -> float:
         return self._objective_value
@@ -486,6 +1087,8 @@ class Solver:
             solver_name = self._solver_name, 
             model = self.__models[self._solver_name], 
             name = name)
+        bool_var._index = len(self.__all_vars[self._solver_name])
+        bool_var._solver = self
         self.__all_vars[self._solver_name].append(bool_var)
         return bool_var
 
@@ -496,6 +1099,8 @@ class Solver:
             lb = lb, 
             ub = ub, 
             name = name)
+        int_var._index = len(self.__all_vars[self._solver_name])
+        int_var._solver = self
         self.__all_vars[self._solver_name].append(int_var)
         return int_var
 
@@ -507,10 +1112,12 @@ class Solver:
             ub = ub, 
             integer = integer, 
             name = name)
+        var._index = len(self.__all_vars[self._solver_name])
+        var._solver = self
         self.__all_vars[self._solver_name].append(var)
         return var
 
-    def add_constraint(self, constraint: Expression, name: str) -> None:
+    def add_constraint(self, constraint: Expression, name: str) -> Constraint:
         if isinstance(constraint, bool):
             tmp_constraint = constraint
             if self.solver_name == SCIP_SOLVER:
@@ -518,34 +1125,160 @@ class Solver:
                 return
         elif isinstance(constraint, Expression):
             tmp_constraint = constraint._var
-        self.__constraint_formula.append(constraint)
+        # 不保留表达式时, 约束只以句柄中的 {变量序号: 系数} 形式记录
+        if self._keep_formula:
+            self.__constraint_formula.append(constraint)
+        enforce = -1
         
         # add constraint
         if self._solver_name == LP_SOLVER:
-            self._lp_model.Add(constraint=tmp_constraint, name=name)
+            backend_constraint = self._lp_model.Add(constraint=tmp_constraint, name=name)
         elif self._solver_name == CP_SAT_SOLVER:
             # 如果想要计算冲突约束, 则需要额外定义 assumption 变量
             if self._compute_IIS:
                 assumption = self.new_bool_var(name=f"_ASSUMPTION_{name}")
-                self._cp_sat_model.Add(tmp_constraint).OnlyEnforceIf(assumption._var)
+                # 新版本ortools中 OnlyEnforceIf() 不再返回约束本身
+                backend_constraint = self._cp_sat_model.Add(tmp_constraint)
+                backend_constraint.OnlyEnforceIf(assumption._var)
                 self._cp_sat_assumptions.append(assumption)
+                enforce = assumption._index
             else:
-                self._cp_sat_model.Add(tmp_constraint)
+                backend_constraint = self._cp_sat_model.Add(tmp_constraint)
         elif self._solver_name == SCIP_SOLVER:
-            self._scip_model.addCons(tmp_constraint, name)
+            self._free_scip_transform()
+            backend_constraint = self._scip_model.addCons(tmp_constraint, name)
+
+        # record linear form of the constraint
+        if isinstance(constraint, bool):
+            terms, lb, ub = {}, (-math.inf if constraint else 1.0), (math.inf if constraint else 0.0)
+        else:
+            try:
+                terms, lb, ub = _linear_row(constraint)
+            except ValueError:
+                terms, lb, ub = None, -math.inf, math.inf
+        handle = Constraint(self, len(self.__constraints), name, backend_constraint, terms, lb, ub, enforce, isinstance(constraint, bool))
+        self.__constraints.append(handle)
+        return handle
+
+    def remove_constraint(self, constraint: Constraint):
+        '''
+        description: 删除约束, 在下一次 solve() 时从求解器中移除. 删除后的约束不能再修改或启用
+        param [Constraint] constraint add_constraint() 返回的约束句柄
+        return [*]
+        '''
+        if constraint._solver is not self:
+            raise ValueError(f'Constraint "{constraint._name}" does not belong to this solver!')
+        constraint._active = False
+        constraint._removed = True
+        self._constraint_changed(constraint)
+        return
+
+    def _var_changed(self, var: Union[IntVar, BoolVar, Variable]):
+        self.__changed_vars[var._index] = var
+        return
+
+    def _constraint_changed(self, constraint: Constraint):
+        self.__changed_constraints[constraint._index] = constraint
+        return
+
+    def _free_scip_transform(self):
+        '''
+        description: SCIP 求解之后需要先释放变换后的问题才能修改模型, 同时上一次的求解结果失效
+        '''
+        if self._scip_model.getStage() != SCIP_STAGE.PROBLEM:
+            self._scip_model.freeTransform()
+            self._scip_sol = []
+            self._objective_value = None
+            self._status = IDLE
+        return
+
+    def _apply_changes(self):
+        '''
+        description: 将上一次求解之后对变量上下界及约束的修改同步到求解器, 只处理被修改的部分
+        '''
+        if not self.__changed_vars and not self.__changed_constraints:
+            return
+        if self._solver_name == SCIP_SOLVER:
+            self._free_scip_transform()
+        all_vars = self.all_vars
+        # CP SAT 直接修改模型proto; 在整个同步过程中保持对proto的引用, 避免子对象引用失效
+        cp_sat_proto = self._cp_sat_model.Proto() if self._solver_name == CP_SAT_SOLVER else None
+
+        for var in self.__changed_vars.values():
+            lb = -math.inf if var._lb is None else var._lb
+            ub = math.inf if var._ub is None else var._ub
+            if self._solver_name == LP_SOLVER:
+                var._var.SetBounds(lb, ub)
+            elif self._solver_name == CP_SAT_SOLVER:
+                _set_repeated(cp_sat_proto.variables[var._var.Index()].domain, [int(lb), int(ub)])
+            elif self._solver_name == SCIP_SOLVER:
+                self._scip_model.chgVarLb(var._var, var._lb)
+                self._scip_model.chgVarUb(var._var, var._ub)
+
+        for constraint in self.__changed_constraints.values():
+            backend_constraint = constraint._constraint
+            # 停用的约束将上下界放宽为无穷
+            lb, ub = (constraint._lb, constraint._ub) if constraint._active else (-math.inf, math.inf)
+            if self._solver_name == LP_SOLVER:
+                if constraint._removed:
+                    backend_constraint.Clear()
+                    backend_constraint.SetBounds(lb, ub)
+                    continue
+                for index in constraint._changed_vars:
+                    backend_constraint.SetCoefficient(all_vars[index]._var, constraint._terms.get(index, 0.0))
+                backend_constraint.SetBounds(lb, ub)
+            elif self._solver_name == CP_SAT_SOLVER:
+                linear = cp_sat_proto.constraints[backend_constraint.Index()].linear
+                if constraint._removed:
+                    # 清空为恒成立的空线性约束
+                    _set_repeated(linear.vars, [])
+                    _set_repeated(linear.coeffs, [])
+                    _set_repeated(linear.domain, [cp_model.INT_MIN, cp_model.INT_MAX])
+                    continue
+                if constraint._changed_vars or constraint._bounds_changed:
+                    _set_repeated(linear.vars, [all_vars[index]._var.Index() for index in constraint._terms.keys()])
+                    _set_repeated(linear.coeffs, [int(coeff) for coeff in constraint._terms.values()])
+                    _set_repeated(linear.domain, [
+                        cp_model.INT_MIN if constraint._lb == -math.inf else int(constraint._lb),
+                        cp_model.INT_MAX if constraint._ub == math.inf else int(constraint._ub)])
+                # CP SAT 通过固定启用变量的取值来停用或启用约束
+                if constraint._active_literal is None and not constraint._active:
+                    constraint._active_literal = self._cp_sat_model.NewBoolVar(f"_ACTIVE_{constraint._name}")
+                    backend_constraint.OnlyEnforceIf(constraint._active_literal)
+                if constraint._active_literal is not None:
+                    value = 1 if constraint._active else 0
+                    _set_repeated(cp_sat_proto.variables[constraint._active_literal.Index()].domain, [value, value])
+            elif self._solver_name == SCIP_SOLVER:
+                if constraint._removed:
+                    self._scip_model.delCons(backend_constraint)
+                    continue
+                for index in constraint._changed_vars:
+                    self._scip_model.chgCoefLinear(backend_constraint, all_vars[index]._var, constraint._terms.get(index, 0.0))
+                self._scip_model.chgLhs(backend_constraint, None if lb == -math.inf else lb)
+                self._scip_model.chgRhs(backend_constraint, None if ub == math.inf else ub)
+            constraint._changed_vars = set()
+            constraint._bounds_changed = False
+
+        self.__changed_vars = {}
+        self.__changed_constraints = {}
         return
 
     # 设置目标函数
     def set_obj(self, coeff: int, var: Union[IntVar, BoolVar, Variable]):
         if _is_real_number(coeff):
             coeff = Constant(coeff)
-        tmp_obj_formula = coeff * var
-        self.__obj_formula.append(tmp_obj_formula)
+        if self._keep_formula:
+            self.__obj_formula.append(coeff * var)
+        if isinstance(coeff, Constant) and var._index is not None:
+            self.__obj_coeffs[var._index] = float(coeff._var)
+        else:
+            self.__nonlinear_obj = True
         if self._solver_name == LP_SOLVER:
             self._lp_obj.SetCoefficient(var._var, coeff._var)
             
         elif self._solver_name == SCIP_SOLVER:
-            self._scip_obj.setObjective(tmp_obj_formula._var, sense='minimize', clear = False) 
+            self._free_scip_transform()
+            self._scip_obj.setObjective(coeff._var * var._var, sense='minimize', clear = False) 
         
         # record objective variable
         self.__all_obj_vars[self._solver_name][var._name] = var
@@ -565,8 +1298,12 @@ class Solver:
         @description: 返回变量取值
         @return [*]
         '''
+        if self._status not in [OPTIMAL, FEASIBLE]:
+            raise ValueError(f"{self._solver_name} solver has no solution, status = {self._status}!")
         value = None
-        if self._solver_name == LP_SOLVER:
+        if self._solution_values is not None:
+            value = float(self._solution_values[var._index])
+        elif self._solver_name == LP_SOLVER:
             value = var._var.solution_value()
         elif self._solver_name == CP_SAT_SOLVER:
             value = self._cp_sat_solver.Value(var._var)
@@ -596,6 +1333,292 @@ class Solver:
             warnings.warn(f'Current solver is "{self._solver_name}". Only "LP_SOLVER" can export mathmatical formula into file!')
         return
 
+    '''
+    =============================================================================
+                                    模型序列化
+    =============================================================================
+    '''
+    # variable type code in serialized model
+    _VAR_CONTINUOUS, _VAR_INTEGER, _VAR_INT, _VAR_BOOL = 0, 1, 2, 3
+
+    def dumps(self) -> bytes:
+        '''
+        description: 将模型(变量, 线性约束, 目标函数)序列化为紧凑的列式二进制数据.
+                     变量上下界, 类型以及CSR格式的约束系数均以numpy数组保存, 名称只保存一次.
+                     CP_SAT_SOLVER 中通过 model.Minimize() / model.Maximize() 设置的线性目标函数也会被保存.
+                     求解结果以及表达式公式(obj_formula, constraint_formula)不会被保存;
+                     包含不是由 add_constraint() 添加的约束时抛出 ValueError.
+        return [bytes]
+        '''
+        return pack_arrays(*self._model_arrays())
+
+    def _model_arrays(self, var_indices: List[int] = None, rows: List[Constraint] = None) -> Tuple[Dict, Dict[str, np.ndarray]]:
+        '''
+        description: 将模型或其中一部分转换为序列化所需的元信息和数组
+        param [List] var_indices 需要保存的变量序号, 缺省为全部变量
+        param [List] rows 需要保存的约束, 只能包含var_indices中的变量, 缺省为全部启用的约束
+        return [Tuple[Dict, Dict[str, np.ndarray]]]
+        '''
+        self._check_backend_constraints()
+        # CP SAT 的目标函数只能直接设置在模型中
+        cp_sat_objective = self._solver_name == CP_SAT_SOLVER and self._cp_sat_model.HasObjective()
+        obj_coeffs, obj_offset, maximize = self._cp_sat_objective() if cp_sat_objective else (self.__obj_coeffs, 0.0, False)
+        rows = [constraint for constraint in self.__constraints if constraint._active] if rows is None else rows
+        if self.__nonlinear_obj or any(constraint._terms is None for constraint in rows):
+            raise ValueError(f"Only linear models can be serialized, but the model of {self._solver_name} contains non-linear terms!")
+        all_vars = self.all_vars
+        var_indices = np.arange(len(all_vars)) if var_indices is None else np.asarray(var_indices, dtype=np.int64)
+        model_vars = [all_vars[index] for index in var_indices.tolist()]
+        # 全局变量序号 -> 子模型中的变量序号
+        position = np.full(len(all_vars) + 1, -1, dtype=np.int64)
+        position[var_indices] = np.arange(len(var_indices))
+
+        var_type = np.array([
+            self._VAR_BOOL if isinstance(var, BoolVar) else
+            self._VAR_INT if isinstance(var, IntVar) else
+            self._VAR_INTEGER if var._integer else self._VAR_CONTINUOUS
+            for var in model_vars
+        ], dtype=np.int8)
+        var_lb = np.array([-math.inf if var._lb is None else var._lb for var in model_vars], dtype=np.float64)
+        var_ub = np.array([math.inf if var._ub is None else var._ub for var in model_vars], dtype=np.float64)
+        obj = np.zeros(len(all_vars) + 1, dtype=np.float64)
+        obj[list(obj_coeffs.keys())] = list(obj_coeffs.values())
+        obj = obj[var_indices]
+
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([len(row._terms) for row in rows], out=indptr[1:])
+        indices = np.fromiter((index for row in rows for index in row._terms.keys()), dtype=np.int64, count=indptr[-1])
+        coeffs = np.fromiter((coeff for row in rows for coeff in row._terms.values()), dtype=np.float64, count=indptr[-1])
+        # -1 (无启用变量) 映射到 position[-1] = -1
+        row_enforce = position[np.array([row._enforce for row in rows], dtype=np.int64)]
+        var_name_offsets, var_name_data = encode_names([var._name for var in model_vars])
+        row_name_offsets, row_name_data = encode_names([row._name for row in rows])
+
+        meta = {
+            "solver_name": self._solver_name,
+            "problem_name": self.problem_name,
+            "time_limit": self._time_limit.total_seconds(),
+            "compute_IIS": self._compute_IIS,
+            "num_threads": self._num_threads,
+            "deterministic": self._deterministic,
+            "keep_formula": self._keep_formula,
+            "cp_sat_objective": cp_sat_objective,
+            "maximize": maximize,
+            # 子模型的目标函数不含常数项
+            "obj_offset": obj_offset if len(var_indices) == len(all_vars) else 0.0,
+        }
+        arrays = {
+            "var_type": var_type,
+            "var_lb": var_lb,
+            "var_ub": var_ub,
+            "obj": obj,
+            "var_name_offsets": var_name_offsets,
+            "var_name_data": var_name_data,
+            "row_lb": np.array([row._lb for row in rows], dtype=np.float64),
+            "row_ub": np.array([row._ub for row in rows], dtype=np.float64),
+            "row_enforce": row_enforce.astype(np.int32),
+            "indptr": indptr,
+            "indices": position[indices].astype(np.int32),
+            "coeffs": coeffs,
+            "row_name_offsets": row_name_offsets,
+            "row_name_data": row_name_data,
+        }
+        return meta, arrays
+
+    def _check_backend_constraints(self):
+        '''
+        description: 序列化只保存约束句柄, 求解器模型中存在其他约束(例如直接调用 model.AddAllDifferent())时抛出 ValueError
+        '''
+        num_constraints = len(self.__constraints)
+        if self._solver_name == LP_SOLVER:
+            num_backend_constraints = self._lp_model.NumConstraints()
+        elif self._solver_name == CP_SAT_SOLVER:
+            num_backend_constraints = len(self._cp_sat_model.Proto().constraints)
+        elif self._solver_name == SCIP_SOLVER:
+            # SCIP 中删除的约束会从模型中移除
+            num_backend_constraints = self._scip_model.getNConss(False)
+            num_constraints = sum(not constraint._removed for constraint in self.__constraints)
+        if num_backend_constraints != num_constraints:
+            raise ValueError(
+                f"The {self._solver_name} model has {num_backend_constraints} constraints but only {num_constraints} "
+                "are added by add_constraint(), the others can not be serialized!")
+        return
+
+    def _cp_sat_objective(self) -> Tuple[Dict[int, float], float, bool]:
+        '''
+        description: 读取 CP SAT 模型中的线性目标函数
+        return [Tuple[Dict[int, float], float, bool]] {变量序号: 系数}, 常数项, 是否最大化
+        '''
+        cp_sat_proto = self._cp_sat_model.Proto()
+        if cp_sat_proto.has_floating_point_objective():
+            objective = cp_sat_proto.floating_point_objective
+            scaling_factor, maximize = 1.0, objective.maximize
+        else:
+            objective = cp_sat_proto.objective
+            if len(objective.domain):
+                raise ValueError(f"The objective domain of the {self._solver_name} model can not be serialized!")
+            # 目标值 = scaling_factor * (sum(coeff * var) + offset), 最大化时 scaling_factor < 0 且系数取反
+            scaling_factor = objective.scaling_factor or 1.0
+            maximize = scaling_factor < 0
+        position = {var._var.Index(): var._index for var in self.all_vars}
+        obj_coeffs: Dict[int, float] = {}
+        for proto_index, coeff in zip(list(objective.vars), list(objective.coeffs)):
+            if proto_index not in position:
+                raise ValueError(f"The objective of the {self._solver_name} model contains a variable that is not created by the Solver!")
+            index = position[proto_index]
+            obj_coeffs[index] = obj_coeffs.get(index, 0.0) + scaling_factor * coeff
+        return obj_coeffs, scaling_factor * objective.offset, maximize
+
+    def save(self, file_path: Union[str, pathlib.Path]):
+        '''
+        description: 将dumps()的结果写入文件
+        param [str, pathlib.Path] file_path 模型文件地址
+        return [*]
+        '''
+        file_path = pathlib.Path(file_path)
+        _create_if_not_exists(file_path.parent)
+        with open(file_path, "wb") as f:
+            f.write(self.dumps())
+        return
+
+    @classmethod
+    def loads(cls, data, solver_name: str = "") -> "Solver":
+        '''
+        description: 从dumps()生成的二进制数据中重建模型. 跳过表达式树, 直接调用求解器接口添加约束, 比重新用python建模快很多.
+                     解析时数组引用data中的内存, 但添加变量和约束时仍会逐列转换为python对象.
+        param [*] data bytes, memoryview或mmap等支持buffer协议的对象
+        param [str] solver_name 重建模型使用的求解器, 缺省为保存时的求解器.
+                                只有CP_SAT_SOLVER会保留计算冲突约束所需的启用变量, 其他求解器中这些约束总是生效
+        return [Solver]
+        '''
+        meta, arrays = unpack_arrays(data)
+        solver_name = solver_name if solver_name else meta["solver_name"]
+        solver = cls(
+            solver_name = solver_name,
+            time_limit = timedelta(seconds=meta["time_limit"]),
+            compute_IIS = meta["compute_IIS"],
+            problem_name = meta["problem_name"],
+            num_threads = meta.get("num_threads", 0),
+            deterministic = meta.get("deterministic", False),
+            keep_formula = meta.get("keep_formula", True),
+        )
+        solver._load_arrays(meta, arrays)
+        return solver
+
+    @classmethod
+    def load(cls, file_path: Union[str, pathlib.Path], solver_name: str = "", use_mmap: bool = True) -> "Solver":
+        '''
+        description: 从save()生成的文件中重建模型
+        param [str, pathlib.Path] file_path 模型文件地址
+        param [str] solver_name 重建模型使用的求解器, 缺省为保存时的求解器
+        param [bool] use_mmap 是否通过内存映射读取文件(不需要先将整个文件读入bytes)
+        return [Solver]
+        '''
+        with open(file_path, "rb") as f:
+            if not use_mmap:
+                return cls.loads(f.read(), solver_name = solver_name)
+            # 不使用with: loads()抛出异常时traceback仍引用着buffer上的数组视图, 此时关闭会抛出BufferError并掩盖原始异常,
+            # 交给垃圾回收关闭
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            solver = cls.loads(buffer, solver_name = solver_name)
+            buffer.close()
+        return solver
+
+    def _load_arrays(self, meta: Dict, arrays: Dict[str, np.ndarray]):
+        '''
+        description: 按照序列化数组创建变量, 约束以及目标函数
+        param [Dict] meta unpack_arrays()返回的元信息
+        param [Dict] arrays unpack_arrays()返回的数组
+        return [*]
+        '''
+        cp_sat_objective = meta.get("cp_sat_objective", False)
+        if cp_sat_objective and self._solver_name != CP_SAT_SOLVER:
+            raise ValueError(f"The model has an objective set on the {CP_SAT_SOLVER} model, it can only be loaded with {CP_SAT_SOLVER}!")
+        model = self.__models[self._solver_name]
+        infinity = math.inf
+        # create variables
+        var_names = decode_names(arrays["var_name_offsets"], arrays["var_name_data"])
+        for var_type, lb, ub, name in zip(arrays["var_type"].tolist(), arrays["var_lb"].tolist(), arrays["var_ub"].tolist(), var_names):
+            if var_type == self._VAR_BOOL:
+                self.new_bool_var(name = name)
+                continue
+            # SCIP 使用 None 表示无穷
+            if self._solver_name == SCIP_SOLVER:
+                lb = None if lb == -infinity else lb
+                ub = None if ub == infinity else ub
+            elif self._solver_name == CP_SAT_SOLVER or var_type == self._VAR_INT:
+                lb, ub = int(lb), int(ub)
+            if var_type == self._VAR_INT:
+                self.new_int_var(lb = lb, ub = ub, name = name)
+            else:
+                self.new_var(lb = lb, ub = ub, integer = var_type == self._VAR_INTEGER, name = name)
+        all_vars = self.all_vars
+        backend_vars = [var._var for var in all_vars]
+
+        # add constraints
+        row_names = decode_names(arrays["row_name_offsets"], arrays["row_name_data"])
+        indptr = arrays["indptr"].tolist()
+        indices = arrays["indices"].tolist()
+        coeffs = arrays["coeffs"].tolist()
+        rows = zip(row_names, arrays["row_lb"].tolist(), arrays["row_ub"].tolist(), arrays["row_enforce"].tolist())
+        for k, (name, lb, ub, enforce) in enumerate(rows):
+            row_indices = indices[indptr[k]: indptr[k + 1]]
+            row_coeffs = coeffs[indptr[k]: indptr[k + 1]]
+            if self._solver_name == LP_SOLVER:
+                backend_constraint = model.RowConstraint(lb, ub, name)
+                for index, coeff in zip(row_indices, row_coeffs):
+                    backend_constraint.SetCoefficient(backend_vars[index], coeff)
+            elif self._solver_name == CP_SAT_SOLVER:
+                expr = cp_model.LinearExpr.WeightedSum([backend_vars[index] for index in row_indices], [int(coeff) for coeff in row_coeffs])
+                backend_constraint = model.AddLinearConstraint(
+                    expr,
+                    cp_model.INT_MIN if lb == -infinity else int(lb),
+                    cp_model.INT_MAX if ub == infinity else int(ub))
+                if enforce >= 0:
+                    backend_constraint.OnlyEnforceIf(backend_vars[enforce])
+                    self._cp_sat_assumptions.append(all_vars[enforce])
+            elif self._solver_name == SCIP_SOLVER:
+                expr = scip_quicksum(coeff * backend_vars[index] for index, coeff in zip(row_indices, row_coeffs))
+                if lb == ub:
+                    constraint = expr == lb
+                elif lb == -infinity:
+                    constraint = expr <= ub
+                elif ub == infinity:
+                    constraint = expr >= lb
+                else:
+                    constraint = (expr >= lb) <= ub
+                backend_constraint = model.addCons(constraint, name)
+            enforce = enforce if self._solver_name == CP_SAT_SOLVER else -1
+            self.__constraints.append(Constraint(
+                self, len(self.__constraints), name, backend_constraint, dict(zip(row_indices, row_coeffs)), lb, ub, enforce))
+
+        # set objective
+        obj = arrays["obj"]
+        obj_indices = np.flatnonzero(obj).tolist()
+        obj_coeffs = obj[obj_indices].tolist()
+        if cp_sat_objective:
+            # CP SAT 只接受整数系数
+            obj_coeffs = [int(coeff) if float(coeff).is_integer() else coeff for coeff in obj_coeffs]
+            obj_offset = meta["obj_offset"]
+            expr = cp_model.LinearExpr.WeightedSum([backend_vars[index] for index in obj_indices], obj_coeffs)
+            expr = expr + (int(obj_offset) if float(obj_offset).is_integer() else obj_offset)
+            if meta["maximize"]:
+                self._cp_sat_model.Maximize(expr)
+            else:
+                self._cp_sat_model.Minimize(expr)
+            return
+        if self._solver_name == LP_SOLVER:
+            for index, coeff in zip(obj_indices, obj_coeffs):
+                self._lp_obj.SetCoefficient(backend_vars[index], coeff)
+        elif self._solver_name == SCIP_SOLVER and obj_indices:
+            self._scip_obj.setObjective(
+                scip_quicksum(coeff * backend_vars[index] for index, coeff in zip(obj_indices, obj_coeffs)),
+                sense='minimize', clear = False)
+        for index, coeff in zip(obj_indices, obj_coeffs):
+            self.__obj_coeffs[index] = coeff
+            self.__all_obj_vars[self._solver_name][all_vars[index]._name] = all_vars[index]
+        return
+
     
     # 求解
     def solve(self) -> str:
@@ -604,14 +1627,21 @@ class Solver:
         @param [*] self
         @return [*]
         '''
-        
+        # 同步上一次求解之后对模型的修改
+        self._apply_changes()
+        self._solution_values = None
+        num_threads = self.num_threads
 
         # lp model
         if self._solver_name == LP_SOLVER:
-            # set time limit
-            if self._time_limit:
-                self._lp_model.set_time_limit(int(self._time_limit.total_seconds() * 1000))
+            # set time limit, linear solver 不能取消时间限制, 不限制时使用一个足够大的值
+            time_limit = max(1, int(self._time_limit.total_seconds() * 1000)) if self._time_limit else 2 ** 62
+            self._lp_model.set_time_limit(time_limit)
             
+            # set number of threads
+            if not self._lp_model.SetNumThreads(num_threads):
+                warnings.warn(f"{self._solver_name} solver does not support num_threads = {num_threads}!")
+
             # 设置是否输出压缩的中间信息
             if self._elaborate:
                 self._lp_model.SuppressOutput()
@@ -630,11 +1660,14 @@ class Solver:
         # cp sat model
         elif self._solver_name == CP_SAT_SOLVER:
             # set time limit
-            if self._time_limit:
-                self._cp_sat_solver.parameters.max_time_in_seconds = int(self._time_limit.total_seconds())
-                self._cp_sat_solver.parameters.num_search_workers = 4 
+            self._cp_sat_solver.parameters.max_time_in_seconds = self._time_limit.total_seconds() if self._time_limit else math.inf
+            # set number of workers
+            parameters = self._cp_sat_solver.parameters
+            _set_cp_sat_workers(parameters, num_threads)
+            # 交替运行各个子求解器而不是并行运行, 保证多线程结果可复现
+            parameters.interleave_search = self._deterministic
             # solve problem
-            _status = self._cp_sat_solver.Solve(self._cp_sat_model)
+            _status = self._cp_sat_solver.Solve(self._cp_sat_model, self._cp_sat_callback)
             # modify solver status
             if _status in self._status_map[CP_SAT_SOLVER].keys():
                 _status = self._status_map[CP_SAT_SOLVER][_status] 
@@ -643,10 +1676,19 @@ class Solver:
         # scip model
         elif self._solver_name == SCIP_SOLVER:
             # set time limit
-            if self._time_limit:
-                self._scip_model.setRealParam('limits/time', self._time_limit.total_seconds())
-            # solve problem
-            self._scip_obj.optimize()
+            self._scip_model.setRealParam('limits/time', self._time_limit.total_seconds() if self._time_limit else self._scip_model.infinity())
+            # set number of threads, parallel parameters only exist in SCIP >= 7
+            try:
+                self._scip_model.setIntParam('parallel/maxnthreads', num_threads)
+                self._scip_model.setIntParam('parallel/mode', 1 if self._deterministic else 0)
+            except KeyError:
+                num_threads = 1
+            # solveConcurrent() 仍是实验性功能, 只有显式设置 num_threads > 1 时才使用;
+            # SCIP 没有编译并行支持时会退回到 optimize()
+            if num_threads > 1 and self._num_threads > 1:
+                self._scip_obj.solveConcurrent()
+            else:
+                self._scip_obj.optimize()
             # get scip result solutions
             self._scip_sol = self._scip_obj.getSols() 
             # modify solver status
@@ -664,6 +1706,352 @@ class Solver:
         self._status = _status
         return _status
 
+    def _find_components(self) -> List[Tuple[List[int], List[Constraint]]]:
+        '''
+        description: 计算变量-约束二分图的连通分量(并查集). 不在任何约束中的变量合并为同一个分量
+        return [List[Tuple[List[int], List[Constraint]]]] 每个分量的 (变量序号, 约束)
+        '''
+        num_vars = len(self.all_vars)
+        parent = list(range(num_vars))
+
+        def find(index: int) -> int:
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+
+        rows = [constraint for constraint in self.__constraints if constraint._active]
+        for row in rows:
+            indices = list(row._terms.keys()) if row._terms is not None else []
+            if row._enforce >= 0:
+                indices.append(row._enforce)
+            if not indices:
+                continue
+            root = find(indices[0])
+            for index in indices[1:]:
+                other = find(index)
+                if other != root:
+                    parent[other] = root
+
+        # 第0个分量包含自由变量以及不含变量的约束(例如 add_constraint(False))
+        component_of_root: Dict[int, int] = {}
+        components: List[Tuple[List[int], List[Constraint]]] = [([], [])]
+        for row in rows:
+            if not row._terms and row._enforce < 0:
+                components[0][1].append(row)
+                continue
+            root = find(next(iter(row._terms.keys())) if row._terms else row._enforce)
+            if root not in component_of_root:
+                component_of_root[root] = len(components)
+                components.append(([], []))
+            components[component_of_root[root]][1].append(row)
+        for index in range(num_vars):
+            components[component_of_root.get(find(index), 0)][0].append(index)
+        return [component for component in components if component[0] or component[1]]
+
+    def solve_decomposed(self, max_workers: int = 0) -> str:
+        '''
+        description: 将模型按照变量-约束图的连通分量分解为相互独立的子模型, 在进程池中并行求解后合并结果.
+                     合并后的状态为各子模型中最差的状态, 目标值为各子模型目标值之和, get_var_value() 的用法不变.
+                     只有一个连通分量时等同于 solve(). 模型中存在不能序列化的部分(非线性项, 不是由 add_constraint() 添加的约束)时抛出 ValueError.
+                     子进程以 spawn 方式启动, 调用脚本需要放在 if __name__ == "__main__": 中
+        param [int] max_workers 并行求解的进程数, 0表示 min(连通分量数, num_threads)
+        return [str] 求解状态
+        '''
+        components = self._find_components()
+        if len(components) <= 1:
+            return self.solve()
+        num_threads = self.num_threads
+        max_workers = max_workers if max_workers > 0 else min(len(components), num_threads)
+        # 子模型平分线程
+        sub_threads = max(1, num_threads // max_workers)
+        models = [pack_arrays(*self._model_arrays(var_indices, rows)) for var_indices, rows in components]
+
+        if max_workers == 1:
+            results = [_solve_model_data(data, sub_threads, self._deterministic, self._elaborate) for data in models]
+        else:
+            # 当前进程中可能已有求解器的工作线程, fork 出的子进程可能死锁
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                chunksize = max(1, len(models) // (max_workers * 4))
+                results = list(executor.map(
+                    _solve_model_data, models, [sub_threads] * len(models),
+                    [self._deterministic] * len(models), [self._elaborate] * len(models), chunksize=chunksize))
+
+        # merge results
+        statuses = [result[0] for result in results]
+        for status in [INFEASIBLE, NOT_SOLVED, FEASIBLE, OPTIMAL]:
+            if status in statuses:
+                break
+        self._solution_values = None
+        if status in [OPTIMAL, FEASIBLE]:
+            self._solution_values = np.empty(len(self.all_vars), dtype=np.float64)
+            for (var_indices, rows), (_, _, values) in zip(components, results):
+                self._solution_values[var_indices] = values
+        objective_values = [result[1] for result in results]
+        self._objective_value = sum(objective_values) if status in [OPTIMAL, FEASIBLE] and None not in objective_values else None
+        self._status = status
+        return status
+
+    def _set_solution_hint(self, values: List[float]):
+        '''
+        description: 将全部变量的取值(例如上一次求解的结果)作为下一次求解的初始解提示
+        param [List] values 与 all_vars 一一对应的变量取值
+        return [*]
+        '''
+        all_vars = self.all_vars
+        if self._solver_name == LP_SOLVER:
+            self._lp_model.SetHint([var._var for var in all_vars], values)
+        elif self._solver_name == CP_SAT_SOLVER:
+            self._cp_sat_model.ClearHints()
+            for var, value in zip(all_vars, values):
+                self._cp_sat_model.AddHint(var._var, int(round(value)))
+        elif self._solver_name == SCIP_SOLVER:
+            self._free_scip_transform()
+            # 部分解不要求可行, 由SCIP启发式补全
+            sol = self._scip_model.createPartialSol() if hasattr(self._scip_model, "createPartialSol") else self._scip_model.createSol()
+            for var, value in zip(all_vars, values):
+                self._scip_model.setSolVal(sol, var._var, value)
+            self._scip_model.addSol(sol)
+        return
+
+    def _clear_solution_hint(self):
+        '''
+        description: 清除初始解提示. linear solver 保留提示时再次求解同一个模型会返回 ABNORMAL
+        '''
+        if self._solver_name == LP_SOLVER:
+            self._lp_model.SetHint([], [])
+        elif self._solver_name == CP_SAT_SOLVER:
+            self._cp_sat_model.ClearHints()
+        return
+
+    def solve_row_generation(
+        self,
+        separator: Callable,
+        max_rounds: int = 100,
+        time_limit: timedelta = timedelta(seconds=0),
+        max_constraints: int = 0,
+    ) -> str:
+        '''
+        description: 行生成(惰性约束). 对于规模很大但绝大多数不起作用的约束族(例如子回路消除约束), 不预先添加,
+                     而是每轮求解后调用 separator 找出当前解违反的约束, 只添加这些约束并以上一轮的解作为提示重新求解,
+                     直到没有违反的约束或者达到限制. 每一轮的统计信息保存在 row_generation_stats 中
+        param [Callable] separator separator(solver) 在当前解上返回违反的约束, 每一项为约束表达式或者 (约束表达式, 约束名称)
+        param [int] max_rounds 最大求解轮数
+        param [timedelta] time_limit 总计算时间限制, 0表示不限制; 每一轮的时间限制不会超过剩余时间
+        param [int] max_constraints 最多添加的约束数量, 0表示不限制
+        return [str] 最后一轮的求解状态; 添加约束之后时间已经用完时不再求解 (SCIP_SOLVER 此时为 IDLE)
+        '''
+        start = time.perf_counter()
+        round_time_limit = self._time_limit
+        total_limit = time_limit.total_seconds()
+        self._row_generation_stats = []
+        num_added = 0
+        stop_reason = ""
+        try:
+            for k in range(max_rounds):
+                if total_limit:
+                    remaining = total_limit - (time.perf_counter() - start)
+                    # 添加约束和设置提示之后时间可能已经用完, 不能再把非正的时间限制传给求解器
+                    if remaining <= 0:
+                        stop_reason = "time limit"
+                        self._clear_solution_hint()
+                        break
+                    if not round_time_limit or remaining < round_time_limit.total_seconds():
+                        self._time_limit = timedelta(seconds=remaining)
+                round_start = time.perf_counter()
+                status = self.solve()
+                self._clear_solution_hint()
+                stats = {
+                    "round": k,
+                    "status": status,
+                    "objective_value": self._objective_value,
+                    "solve_time": time.perf_counter() - round_start,
+                    "violated": 0,
+                    "added": 0,
+                    "total_added": num_added,
+                }
+                self._row_generation_stats.append(stats)
+                if status not in [OPTIMAL, FEASIBLE]:
+                    break
+
+                violated = list(separator(self))
+                stats["violated"] = len(violated)
+                if not violated:
+                    break
+                # 达到限制时不再添加约束, 保证返回的状态和变量取值对应当前的模型
+                if k == max_rounds - 1:
+                    stop_reason = "round limit"
+                elif max_constraints and num_added >= max_constraints:
+                    stop_reason = "constraint limit"
+                elif total_limit and time.perf_counter() - start >= total_limit:
+                    stop_reason = "time limit"
+                if stop_reason:
+                    break
+                if max_constraints:
+                    violated = violated[:max_constraints - num_added]
+                # 以当前解作为下一轮的初始解提示
+                values = [self.get_var_value(var) for var in self.all_vars]
+                for item in violated:
+                    constraint, name = item if isinstance(item, tuple) else (item, f"_ROW_{k}_{stats['added']}")
+                    self.add_constraint(constraint, name = name)
+                    stats["added"] += 1
+                num_added += stats["added"]
+                stats["total_added"] = num_added
+                self._set_solution_hint(values)
+        finally:
+            self._time_limit = round_time_limit
+
+        if stop_reason:
+            warnings.warn(f"Row generation stopped by {stop_reason}, the solution may violate constraints that are not added!")
+        return self._status
+
+    def solve_pool(self, k: int, diversity: int = 1) -> SolutionPool:
+        '''
+        description: 求解一次并返回至多k个不同的解, 不需要重复建模和多次求解.
+                     CP_SAT_SOLVER: 没有目标函数时枚举可行解(enumerate_all_solutions); 有目标函数时先求解, 再在模型副本中
+                                    按目标值从好到差的区间依次枚举可行解, 直到得到k个解或者不存在更多的解.
+                                    多线程时CP SAT不会枚举全部解, 因此枚举总是单线程进行(有目标函数时的第一次求解仍使用 num_threads).
+                                    每个区间需要完整枚举, 大模型中可能很慢; time_limit 限制整个计算时间, 超时或者浮点目标函数时
+                                    使用已经找到的解(包括求解过程中找到的解), 不保证是最好的k个, 也可能少于k个.
+                     SCIP_SOLVER / LP_SOLVER: 求解过程中SCIP保存的解(getSols / NextSolution), 目标值从好到差.
+                     求解结束后 get_var_value() 和 objective_value 对应解池中的第一个解
+        param [int] k 解的最大数量
+        param [int] diversity 任意两个解之间至少有 diversity 个变量的取值不同
+        return [SolutionPool]
+        '''
+        all_vars = self.all_vars
+        builder = _PoolBuilder(k, len(all_vars), diversity)
+        if self._solver_name == CP_SAT_SOLVER:
+            parameters = self._cp_sat_solver.parameters
+            enumerate_all_solutions = parameters.enumerate_all_solutions
+            num_threads = self._num_threads
+            num_workers = _set_cp_sat_workers(parameters, 1)
+            indices = np.array([var._var.Index() for var in all_vars], dtype=np.int64)
+            # 目标值 = scaling_factor * (sum(coeff * var) + offset), 求解器总是最小化 sum(coeff * var)
+            # 读取 proto 中的 objective 会创建该字段, 因此需要先判断 HasObjective()
+            has_objective = self._cp_sat_model.HasObjective()
+            objective_proto = self._cp_sat_model.Proto().objective if has_objective else None
+            objective = None
+            if has_objective and len(objective_proto.coeffs):
+                objective = (
+                    np.array(list(objective_proto.vars), dtype=np.int64),
+                    np.array(list(objective_proto.coeffs), dtype=np.float64),
+                    objective_proto.offset,
+                    objective_proto.scaling_factor or 1.0)
+            try:
+                if not has_objective:
+                    # 没有目标函数时直接枚举可行解
+                    self._cp_sat_callback = _CpSatPoolCallback(indices, builder = builder)
+                    parameters.enumerate_all_solutions = True
+                    self._num_threads = 1
+                    self.solve()
+                else:
+                    start = time.perf_counter()
+                    self._cp_sat_callback = _CpSatPoolCallback(indices, objective)
+                    status = self.solve()
+                    if objective is not None and status in [OPTIMAL, FEASIBLE]:
+                        # time_limit 限制整个 solve_pool 的计算时间
+                        deadline = start + self._time_limit.total_seconds() if self._time_limit else 0
+                        self._enumerate_cp_sat_pool(indices, objective, builder, deadline)
+                    # 浮点目标函数不能作为约束或者超时的时候, 补充求解过程中找到的解
+                    for values, objective_value in reversed(self._cp_sat_callback.solutions):
+                        builder.add(values, objective_value)
+                    if objective is not None:
+                        # 目标值从好到差
+                        order = np.argsort(builder.objective_values[:builder.size] / objective[3], kind="stable")
+                        builder.values[:builder.size] = builder.values[order]
+                        builder.objective_values[:builder.size] = builder.objective_values[order]
+            finally:
+                self._cp_sat_callback = None
+                parameters.enumerate_all_solutions = enumerate_all_solutions
+                self._num_threads = num_threads
+                _set_cp_sat_workers(parameters, num_workers)
+
+        elif self._solver_name == SCIP_SOLVER:
+            # SCIP默认最多保存100个解
+            self._free_scip_transform()
+            self._scip_model.setIntParam("limits/maxsol", max(k, self._scip_model.getParam("limits/maxsol")))
+            self.solve()
+            for sol in self._scip_sol:
+                if builder.full:
+                    break
+                builder.add([sol[var._var] for var in all_vars], self._scip_model.getSolObjVal(sol))
+
+        elif self._solver_name == LP_SOLVER:
+            status = self.solve()
+            if status in [OPTIMAL, FEASIBLE]:
+                objective = self._lp_model.Objective()
+                builder.add([var._var.solution_value() for var in all_vars], objective.Value())
+                # 依次读取SCIP保存的其他解
+                while not builder.full and self._lp_model.NextSolution():
+                    builder.add([var._var.solution_value() for var in all_vars], objective.Value())
+
+        pool = SolutionPool(
+            builder.values[:builder.size],
+            builder.objective_values[:builder.size],
+            np.array([_is_integer_var(var) for var in all_vars], dtype=bool))
+        if len(pool):
+            self._solution_values = pool.values[0]
+            if not np.isnan(pool.objective_values[0]):
+                self._objective_value = float(pool.objective_values[0])
+        return pool
+
+    def _enumerate_cp_sat_pool(self, indices: np.ndarray, objective: Tuple, builder: _PoolBuilder, deadline: float = 0):
+        '''
+        description: 在模型副本中去掉目标函数, 将 sum(coeff * var) 依次限制在 [best, best], [best + 1, best + 2], [best + 3, best + 6], ...
+                     (区间宽度加倍) 中单线程枚举可行解, 直到解池已满, 区间超出目标函数的取值范围或者超时.
+                     宽度为1的区间内目标值相同, 解直接加入解池, 直到解池已满或者区间枚举完毕;
+                     更宽的区间完整枚举后按目标值排序加入解池, 解的数量超过上限时将区间宽度减半后重新枚举.
+                     每个区间都需要完整枚举, 大模型中可能很慢
+        param [np.ndarray] indices 全部变量在cp model中的序号
+        param [Tuple] objective (变量序号, 系数, offset, scaling_factor)
+        param [_PoolBuilder] builder
+        param [float] deadline time.perf_counter() 的截止时间, 0表示不限制
+        return [*]
+        '''
+        variables, coeffs, offset, scaling_factor = objective
+        best = round(self._cp_sat_solver.ObjectiveValue() / scaling_factor - offset)
+        model = self._cp_sat_model.clone()
+        # 在整个枚举过程中保持对proto的引用, 避免子对象引用失效
+        cp_sat_proto = model.Proto()
+        domains = [list(cp_sat_proto.variables[index].domain) for index in variables.tolist()]
+        worst = int(sum(coeff * (domain[-1] if coeff > 0 else domain[0]) for coeff, domain in zip(coeffs.tolist(), domains)))
+        expr = cp_model.LinearExpr.WeightedSum(
+            [model.GetIntVarFromProtoIndex(index) for index in variables.tolist()], [int(coeff) for coeff in coeffs.tolist()])
+        bound = model.AddLinearConstraint(expr, best, best)
+        model.ClearObjective()
+        self._cp_sat_solver.parameters.enumerate_all_solutions = True
+        # 多线程时不会枚举全部解
+        _set_cp_sat_workers(self._cp_sat_solver.parameters, 1)
+        # 宽区间最多保存的解的数量
+        limit = max(100, 10 * len(builder.objective_values))
+        lower, width = best, 1
+        while not builder.full and lower <= worst:
+            if deadline:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cp_sat_solver.parameters.max_time_in_seconds = remaining
+            upper = lower + width - 1
+            _set_repeated(cp_sat_proto.constraints[bound.Index()].linear.domain, [lower, upper])
+            if width == 1:
+                callback = _CpSatPoolCallback(indices, objective, builder = builder)
+                status = self._cp_sat_solver.Solve(model, callback)
+            else:
+                callback = _CpSatPoolCallback(indices, objective, limit = limit)
+                status = self._cp_sat_solver.Solve(model, callback)
+                if len(callback.solutions) >= limit:
+                    # 区间内的解可能没有全部枚举, 缩小区间重新枚举
+                    width //= 2
+                    continue
+                for values, objective_value in sorted(callback.solutions, key = lambda item: item[1] / scaling_factor):
+                    builder.add(values, objective_value)
+            # 超时
+            if status == cp_model.UNKNOWN:
+                break
+            lower, width = upper + 1, 2 * width
+        return
+
     # 计算冲突约束
     def find_conflict_constraints(self):
         '''
@@ -687,6 +2075,26 @@ class Solver:
         else:
             raise ValueError(f"{self._solver_name} solver return UNDEFINED STATUS = {_status}!")
 
+def _solve_model_data(data: bytes, num_threads: int, deterministic: bool = False, elaborate: bool = False) -> Tuple[str, float, np.ndarray]:
+    '''
+    description: 在子进程中求解序列化的子模型
+    param [bytes] data Solver.dumps() 格式的模型
+    param [int] num_threads 求解线程数
+    param [bool] deterministic 多线程求解时是否保证结果可复现
+    param [bool] elaborate 是否输出求解过程
+    return [Tuple[str, float, np.ndarray]] 求解状态, 目标值, 变量取值
+    '''
+    solver = Solver.loads(data)
+    solver.num_threads = num_threads
+    solver.deterministic = deterministic
+    solver._elaborate = elaborate
+    status = solver.solve()
+    values = None
+    if status in [OPTIMAL, FEASIBLE]:
+        values = np.array([solver.get_var_value(var) for var in solver.all_vars], dtype=np.float64)
+    return status, solver.objective_value, values
+
+
 class DictBoolVar:
     def __repr__(self) -> str:
         return f"{self.__name} var collection: {self.__var_cnt}"
@@ -8,3 +8,5 @@ LastEditors: your name
 Description: 
 FilePath: \\pymip\\pymip\\__init__.py
 '''
+
+from .Solver import dot, quicksum